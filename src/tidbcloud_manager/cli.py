@@ -2,40 +2,74 @@ from __future__ import annotations
 
 import argparse
 import sys
+from typing import Callable
 
-from .secure_executor import main as secure_executor_main
-from .session_manager import main as session_manager_main
-from .knowledge_export import main as knowledge_main
-from .openapi_tools import main as openapi_main
-
-
-def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(prog="tidbcloud-manager")
-    sub = parser.add_subparsers(dest="cmd", required=True)
 
+def _add_secure_exec(sub: argparse._SubParsersAction) -> None:
     se = sub.add_parser("secure-exec", help="Execute one request without exposing credentials")
     se.add_argument("mode", choices=["http", "cli", "poll"])
     se.add_argument("request_json")
     se.add_argument("--sut", dest="sut_name", default=None, help="SUT name under ./configs (e.g. tidbx)")
 
+
+def _add_session(sub: argparse._SubParsersAction) -> None:
     sm = sub.add_parser("session", help="Manage exploration sessions and generate YAML")
     sm.add_argument("args", nargs=argparse.REMAINDER)
 
+
+def _add_knowledge(sub: argparse._SubParsersAction) -> None:
     kn = sub.add_parser("knowledge", help="Export local knowledge to repo YAML")
     kn.add_argument("args", nargs=argparse.REMAINDER)
 
+
+def _add_openapi(sub: argparse._SubParsersAction) -> None:
     oa = sub.add_parser("openapi", help="List/extract operations from openapi.json")
     oa.add_argument("args", nargs=argparse.REMAINDER)
 
+
+_SUBCOMMANDS: dict[str, Callable[[argparse._SubParsersAction], None]] = {
+    "secure-exec": _add_secure_exec,
+    "session": _add_session,
+    "knowledge": _add_knowledge,
+    "openapi": _add_openapi,
+}
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    if argv and argv[0] in _SUBCOMMANDS:
+        return argv[0]
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    parser = argparse.ArgumentParser(prog="tidbcloud-manager")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    # Only build the subparser that will actually be used; --help and unknown input get the full parser
+    # so argparse can list every choice.
+    cmd = _sniff_subcommand(argv)
+    if cmd:
+        _SUBCOMMANDS[cmd](sub)
+    else:
+        for add in _SUBCOMMANDS.values():
+            add(sub)
+
     ns = parser.parse_args(argv)
 
+    # Subcommand modules are imported lazily so each invocation only pays for its own dependencies.
     if ns.cmd == "secure-exec":
+        from .secure_executor import main as secure_executor_main
+
         extra = []
         if ns.sut_name:
             extra = ["--sut", ns.sut_name]
         return secure_executor_main([ns.mode, ns.request_json, *extra])
 
     if ns.cmd == "session":
+        from .session_manager import main as session_manager_main
+
         if not ns.args:
             return session_manager_main([])
         # Drop a leading "--" if present (common when forwarding remainder args).
@@ -43,12 +77,16 @@ def main(argv: list[str] | None = None) -> int:
         return session_manager_main(args)
 
     if ns.cmd == "knowledge":
+        from .knowledge_export import main as knowledge_main
+
         if not ns.args:
             return knowledge_main([])
         args = ns.args[1:] if ns.args and ns.args[0] == "--" else ns.args
         return knowledge_main(args)
 
     if ns.cmd == "openapi":
+        from .openapi_tools import main as openapi_main
+
         if not ns.args:
             return openapi_main([])
         args = ns.args[1:] if ns.args and ns.args[0] == "--" else ns.args
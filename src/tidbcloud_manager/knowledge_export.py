@@ -4,51 +4,74 @@ import argparse
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
 
-import yaml
-
-from .runtime import canonical_sut_name, resolve_skill_root
-
-
-_RE_LONG_NUMBER = re.compile(r"\b\d{6,}\b")
-_RE_HEX = re.compile(r"\b[0-9a-fA-F]{8,}\b")
-_RE_URL = re.compile(r"https?://[^\s'\"<>]+")
+from .runtime import (
+    _EMPTY_DICT,
+    _EMPTY_LIST,
+    canonical_sut_name,
+    map_string_leaves,
+    resolve_skill_root,
+    safe_dump_yaml,
+    safe_load_yaml,
+)
+
+
+# Single-pass sanitizer, equivalent to running the URL, long-number and hex-run substitutions one after another.
+# Alternation order keeps a pure-digit run reported as a number rather than hex. Numbers and hex runs may also end
+# where a URL starts: the sequential URL pass used to put "<REDACTED_URL>" there, which gave them a word boundary.
+_URL_PATTERN = r"https?://[^\s'\"<>]+"
+_RE_SENSITIVE = re.compile(
+    rf"(?P<url>{_URL_PATTERN})"
+    rf"|(?P<num>\b\d{{6,}}(?:\b|(?={_URL_PATTERN})))"
+    rf"|(?P<hex>\b[0-9a-fA-F]{{8,}}(?:\b|(?={_URL_PATTERN})))"
+)
+_REPLACEMENTS = {"url": "<REDACTED_URL>", "num": "<REDACTED_NUM>", "hex": "<REDACTED_HEX>"}
+# Every match is at least 6 chars. URLs need ":" and numbers need a `\d` digit (any Unicode decimal, e.g. "１"), so
+# text with neither can only match an all-letter hex run, which the much cheaper _RE_HEX_LETTERS screens for.
+_MIN_MATCH_LEN = 6
+_RE_DIGIT_OR_COLON = re.compile(r"[\d:]")
+_RE_HEX_LETTERS = re.compile(r"[a-fA-F]{8}")
+
+# Knowledge files repeat the same strings (operation ids, messages, keywords) many times; memoize per export.
+_SANITIZE_CACHE: dict[str, str] = {}
+_SANITIZE_CACHE_MAX = 4096
+
+
+def _redact_match(m: re.Match[str]) -> str:
+    return _REPLACEMENTS[m.lastgroup or ""]
 
 
 def _sanitize_text(value: str) -> str:
-    value = _RE_URL.sub("<REDACTED_URL>", value)
-    value = _RE_LONG_NUMBER.sub("<REDACTED_NUM>", value)
-    value = _RE_HEX.sub("<REDACTED_HEX>", value)
-    return value
-
-
-def _sanitize(obj: Any) -> Any:
-    if isinstance(obj, str):
-        return _sanitize_text(obj)
-    if isinstance(obj, dict):
-        return {k: _sanitize(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitize(v) for v in obj]
-    return obj
+    if len(value) < _MIN_MATCH_LEN:
+        return value
+    if _RE_DIGIT_OR_COLON.search(value) is None and _RE_HEX_LETTERS.search(value) is None:
+        return value
+    cached = _SANITIZE_CACHE.get(value)
+    if cached is None:
+        cached = _RE_SENSITIVE.sub(_redact_match, value)
+        if len(_SANITIZE_CACHE) < _SANITIZE_CACHE_MAX:
+            _SANITIZE_CACHE[value] = cached
+    return cached
 
 
 def _read_yaml(path: Path) -> dict:
     if not path.exists():
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return safe_load_yaml(path.read_bytes()) or {}
 
 
 def _write_yaml(path: Path, data: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    # Wide lines keep long messages on one line (fewer wrap decisions, cleaner diffs); emit bytes for one write.
+    data_bytes = safe_dump_yaml(
+        data, default_flow_style=False, allow_unicode=True, sort_keys=False, width=4096, encoding="utf-8"
+    )
+    path.write_bytes(data_bytes)
 
 
 def _pitfall_key(p: dict) -> tuple:
-    trigger = p.get("trigger", {}) or {}
-    error_pattern = p.get("error_pattern", {}) or {}
+    trigger = p.get("trigger") or _EMPTY_DICT
+    error_pattern = p.get("error_pattern") or _EMPTY_DICT
     return (
         trigger.get("operation_id", ""),
         trigger.get("missing_variable", ""),
@@ -58,10 +81,10 @@ def _pitfall_key(p: dict) -> tuple:
 
 
 def _pattern_key(p: dict) -> tuple:
-    trigger = p.get("trigger", {}) or {}
+    trigger = p.get("trigger") or _EMPTY_DICT
     return (
         p.get("name", ""),
-        ",".join(trigger.get("intent_keywords", []) or []),
+        ",".join(trigger.get("intent_keywords") or _EMPTY_LIST),
         str(trigger.get("precondition", "") or ""),
     )
 
@@ -75,50 +98,52 @@ def export_knowledge(
 ) -> dict:
     sut_name = canonical_sut_name(sut_name)
     knowledge_dir = from_dir or (Path.home() / ".tidbcloud-manager" / "knowledge" / sut_name)
-    pitfalls_src = _read_yaml(knowledge_dir / "pitfalls.yaml").get("pitfalls", []) or []
-    patterns_src = _read_yaml(knowledge_dir / "patterns.yaml").get("patterns", []) or []
+    pitfalls_src = _read_yaml(knowledge_dir / "pitfalls.yaml").get("pitfalls") or _EMPTY_LIST
+    patterns_src = _read_yaml(knowledge_dir / "patterns.yaml").get("patterns") or _EMPTY_LIST
 
     pitfalls = []
     for p in pitfalls_src:
         occ = int(p.get("occurrence_count", 0) or 0)
         if occ < min_occurrences:
             continue
-        clean = _sanitize(p)
+        clean = map_string_leaves(p, _sanitize_text)
         # Drop timestamps that tend to be noisy in git diffs.
         clean.pop("last_occurred", None)
         pitfalls.append(clean)
 
     patterns = []
     for p in patterns_src:
-        clean = _sanitize(p)
+        clean = map_string_leaves(p, _sanitize_text)
         clean.pop("last_used", None)
         patterns.append(clean)
+    _SANITIZE_CACHE.clear()
 
     existing = _read_yaml(out_path)
     merged = dict(existing) if isinstance(existing, dict) else {}
     merged.setdefault("pitfalls", [])
     merged.setdefault("patterns", [])
 
-    existing_pitfalls = { _pitfall_key(p): p for p in (merged.get("pitfalls", []) or []) if isinstance(p, dict) }
-    existing_patterns = { _pattern_key(p): p for p in (merged.get("patterns", []) or []) if isinstance(p, dict) }
+    # Only membership matters for dedupe, so keep the keys in sets and compute each key once.
+    pitfall_keys = {_pitfall_key(p) for p in (merged.get("pitfalls") or _EMPTY_LIST) if isinstance(p, dict)}
+    pattern_keys = {_pattern_key(p) for p in (merged.get("patterns") or _EMPTY_LIST) if isinstance(p, dict)}
 
     added_pitfalls = 0
     for p in pitfalls:
         k = _pitfall_key(p)
-        if k in existing_pitfalls:
+        if k in pitfall_keys:
             # Keep repo version as source of truth; do not overwrite silently.
             continue
         merged["pitfalls"].append(p)
-        existing_pitfalls[k] = p
+        pitfall_keys.add(k)
         added_pitfalls += 1
 
     added_patterns = 0
     for p in patterns:
         k = _pattern_key(p)
-        if k in existing_patterns:
+        if k in pattern_keys:
             continue
         merged["patterns"].append(p)
-        existing_patterns[k] = p
+        pattern_keys.add(k)
         added_patterns += 1
 
     meta = merged.setdefault("export", {})
@@ -174,7 +199,7 @@ def main(argv: list[str] | None = None) -> int:
             from_dir=from_dir,
             min_occurrences=int(ns.min_occurrences),
         )
-        print(yaml.safe_dump(result, sort_keys=False, allow_unicode=True))
+        print(safe_dump_yaml(result, sort_keys=False, allow_unicode=True))
         return 0
 
     return 1
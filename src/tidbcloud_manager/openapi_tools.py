@@ -1,42 +1,92 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+from collections import deque
 from pathlib import Path
 from typing import Any, Iterable
 
-import yaml
-
-from .runtime import canonical_sut_name, resolve_skill_root
+from .runtime import (
+    _EMPTY_DICT,
+    canonical_sut_name,
+    json_dumps_pretty,
+    json_loads,
+    resolve_skill_root,
+    safe_dump_yaml,
+    safe_load_yaml,
+)
 
 
 def _load_json(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f) or {}
+    return json_loads(path.read_bytes()) or {}
 
 
+@functools.lru_cache(maxsize=8)
 def _spec_path_for_sut(skill_root: Path, sut_name: str) -> Path:
     sut_dir = skill_root / "configs" / sut_name
     sut_yaml = sut_dir / "sut.yaml"
     openapi_rel = "openapi.json"
     if sut_yaml.exists():
-        with open(sut_yaml, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
-        openapi_rel = (cfg.get("specs", {}) or {}).get("openapi", openapi_rel)
+        cfg = safe_load_yaml(sut_yaml.read_bytes()) or {}
+        openapi_rel = (cfg.get("specs") or _EMPTY_DICT).get("openapi", openapi_rel)
     return sut_dir / openapi_rel
 
 
-def load_openapi_spec(*, sut_name: str, skill_root: Path | None = None) -> tuple[Path, dict]:
+def resolve_openapi_spec_path(*, sut_name: str, skill_root: Path | None = None) -> Path:
     root = skill_root or resolve_skill_root()
     spec_path = _spec_path_for_sut(root, canonical_sut_name(sut_name))
     if not spec_path.exists():
         raise FileNotFoundError(f"OpenAPI spec not found: {spec_path}")
+    return spec_path
+
+
+@functools.lru_cache(maxsize=8)
+def _load_openapi_spec_cached(root: str, sut_name: str) -> tuple[Path, dict]:
+    spec_path = resolve_openapi_spec_path(sut_name=sut_name, skill_root=Path(root))
     return spec_path, _load_json(spec_path)
 
 
-def iter_operations(spec: dict) -> Iterable[dict]:
-    paths = spec.get("paths", {}) or {}
-    for path, methods in paths.items():
+def load_openapi_spec(*, sut_name: str, skill_root: Path | None = None) -> tuple[Path, dict]:
+    # Parsed once per (skill_root, sut) per process; callers must treat the returned spec as read-only.
+    root = skill_root or resolve_skill_root()
+    return _load_openapi_spec_cached(str(root), canonical_sut_name(sut_name))
+
+
+@functools.lru_cache(maxsize=None)
+def _ijson() -> Any:
+    # Optional (`speedups` extra); None when not installed.
+    try:
+        import ijson  # type: ignore
+    except Exception:
+        return None
+    return ijson
+
+
+def _stream_paths(spec_path: Path) -> Iterable[tuple[str, Any]]:
+    """Yield (path, methods) pairs without materializing the whole spec when ijson is available."""
+    ijson = _ijson()
+    if ijson is None:
+        yield from (_load_json(spec_path).get("paths") or _EMPTY_DICT).items()
+        return
+
+    with open(spec_path, "rb") as f:
+        yield from ijson.kvitems(f, "paths", use_float=True)
+
+
+def _stream_definitions(spec_path: Path) -> dict:
+    """Load only the top-level `definitions` object (skipping `paths`) when ijson is available."""
+    ijson = _ijson()
+    if ijson is None:
+        return _load_json(spec_path).get("definitions") or {}
+
+    with open(spec_path, "rb") as f:
+        for defs in ijson.items(f, "definitions", use_float=True):
+            return defs or {}
+    return {}
+
+
+def _operations_from_paths(paths: Iterable[tuple[str, Any]]) -> Iterable[dict]:
+    for path, methods in paths:
         if not isinstance(methods, dict):
             continue
         for method, operation in methods.items():
@@ -54,13 +104,16 @@ def iter_operations(spec: dict) -> Iterable[dict]:
             }
 
 
-def list_operations(
-    spec: dict, *, query: str | None = None, limit: int | None = None
-) -> list[dict]:
+def iter_operations(spec: dict) -> Iterable[dict]:
+    return _operations_from_paths((spec.get("paths") or _EMPTY_DICT).items())
+
+
+def _filter_operations(ops: Iterable[dict], *, query: str | None, limit: int | None) -> list[dict]:
     q = (query or "").strip().lower()
     out: list[dict] = []
-    for op in iter_operations(spec):
-        if q:
+    for op in ops:
+        # Most queries target the operationId; only build the combined haystack when that check misses.
+        if q and q not in str(op.get("operationId", "")).lower():
             hay = f"{op.get('operationId','')} {op.get('method','')} {op.get('path','')} {op.get('summary','')}".lower()
             if q not in hay:
                 continue
@@ -70,16 +123,30 @@ def list_operations(
     return out
 
 
+def list_operations(
+    spec: dict, *, query: str | None = None, limit: int | None = None
+) -> list[dict]:
+    return _filter_operations(iter_operations(spec), query=query, limit=limit)
+
+
+def list_operations_from_file(
+    spec_path: Path, *, query: str | None = None, limit: int | None = None
+) -> list[dict]:
+    # Stops reading the file as soon as `limit` operations matched.
+    return _filter_operations(_operations_from_paths(_stream_paths(spec_path)), query=query, limit=limit)
+
+
 def _collect_refs(obj: Any, refs: set[str]) -> None:
-    if isinstance(obj, dict):
-        ref = obj.get("$ref")
-        if isinstance(ref, str):
-            refs.add(ref)
-        for v in obj.values():
-            _collect_refs(v, refs)
-    elif isinstance(obj, list):
-        for item in obj:
-            _collect_refs(item, refs)
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            ref = cur.get("$ref")
+            if isinstance(ref, str):
+                refs.add(ref)
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
 
 
 def _schema_name_from_ref(ref: str) -> str:
@@ -87,17 +154,17 @@ def _schema_name_from_ref(ref: str) -> str:
 
 
 def _extract_definitions(spec: dict, refs: set[str]) -> dict:
-    defs = spec.get("definitions", {}) or {}
-    extracted: dict[str, Any] = {}
-    processed: set[str] = set()
+    return _close_definitions(spec.get("definitions") or _EMPTY_DICT, refs)
 
-    queue = set(refs)
-    while queue:
-        ref = queue.pop()
-        if ref in processed:
-            continue
-        processed.add(ref)
 
+def _close_definitions(defs: dict, refs: set[str]) -> dict:
+    extracted: dict[str, Any] = {}
+    # Every ref is enqueued at most once, so each schema subtree is walked at most once. FIFO order also
+    # keeps the output order stable across runs (set.pop() order depends on string hashing).
+    seen: set[str] = set(refs)
+    queue = deque(sorted(refs))
+    while queue:
+        ref = queue.popleft()
         if not ref.startswith("#/definitions/"):
             continue
 
@@ -107,9 +174,11 @@ def _extract_definitions(spec: dict, refs: set[str]) -> dict:
             continue
 
         extracted[name] = schema
-        new_refs: set[str] = set()
-        _collect_refs(schema, new_refs)
-        queue |= (new_refs - processed)
+        sub_refs: set[str] = set()
+        _collect_refs(schema, sub_refs)
+        for sub_ref in sorted(sub_refs - seen):
+            seen.add(sub_ref)
+            queue.append(sub_ref)
 
     # Drop noisy common types if present.
     extracted.pop("googlerpcStatus", None)
@@ -118,27 +187,54 @@ def _extract_definitions(spec: dict, refs: set[str]) -> dict:
     return extracted
 
 
-def extract_operation(spec: dict, operation_id: str) -> dict:
-    found_path: str | None = None
-    found_method: str | None = None
-    found_operation: dict | None = None
-
-    for path, methods in (spec.get("paths", {}) or {}).items():
+def _find_operation(
+    paths: Iterable[tuple[str, Any]], operation_id: str
+) -> tuple[str, str, dict]:
+    for path, methods in paths:
         if not isinstance(methods, dict):
             continue
         for method, op in methods.items():
             if not isinstance(op, dict):
                 continue
             if op.get("operationId") == operation_id:
-                found_path = path
-                found_method = str(method).lower()
-                found_operation = op
-                break
-        if found_operation:
-            break
+                return path, str(method).lower(), op
+
+    raise ValueError(f"Operation not found: {operation_id}")
+
+
+# Dicts can't be weakly referenced, so the index cache holds the spec itself and checks identity on lookup.
+_OP_INDEX_CACHE: dict[int, tuple[dict, dict[str, tuple[str, str, dict]]]] = {}
+_OP_INDEX_CACHE_MAX = 8
+
+
+def _operation_index(spec: dict) -> dict[str, tuple[str, str, dict]]:
+    cached = _OP_INDEX_CACHE.get(id(spec))
+    if cached is not None and cached[0] is spec:
+        return cached[1]
+
+    index: dict[str, tuple[str, str, dict]] = {}
+    for path, methods in (spec.get("paths") or _EMPTY_DICT).items():
+        if not isinstance(methods, dict):
+            continue
+        for method, op in methods.items():
+            if not isinstance(op, dict):
+                continue
+            operation_id = op.get("operationId")
+            if operation_id:
+                # First occurrence wins, matching the previous linear scan.
+                index.setdefault(operation_id, (path, str(method).lower(), op))
+
+    if len(_OP_INDEX_CACHE) >= _OP_INDEX_CACHE_MAX:
+        _OP_INDEX_CACHE.pop(next(iter(_OP_INDEX_CACHE)))
+    _OP_INDEX_CACHE[id(spec)] = (spec, index)
+    return index
 
-    if not found_operation or not found_path or not found_method:
+
+def extract_operation(spec: dict, operation_id: str) -> dict:
+    found = _operation_index(spec).get(operation_id)
+    if found is None:
         raise ValueError(f"Operation not found: {operation_id}")
+    found_path, found_method, found_operation = found
 
     refs: set[str] = set()
     _collect_refs(found_operation, refs)
@@ -150,10 +246,35 @@ def extract_operation(spec: dict, operation_id: str) -> dict:
     }
 
 
+def extract_operation_from_file(spec_path: Path, operation_id: str) -> dict:
+    spec: dict | None = None
+    if _ijson() is None:
+        # Parse once and scan to the first hit; going through extract_operation would build an _operation_index
+        # and pin this one-off spec in _OP_INDEX_CACHE.
+        spec = _load_json(spec_path)
+        paths: Iterable[tuple[str, Any]] = (spec.get("paths") or _EMPTY_DICT).items()
+    else:
+        # Two streaming passes: one over `paths` for the operation, one for `definitions` to resolve its refs.
+        paths = _stream_paths(spec_path)
+    found_path, found_method, found_operation = _find_operation(paths, operation_id)
+
+    refs: set[str] = set()
+    _collect_refs(found_operation, refs)
+    if spec is not None:
+        definitions = _extract_definitions(spec, refs)
+    else:
+        definitions = _close_definitions(_stream_definitions(spec_path), refs)
+
+    return {
+        "paths": {found_path: {found_method: found_operation}},
+        "definitions": definitions,
+    }
+
+
 def _dump(data: Any, fmt: str) -> str:
     if fmt == "yaml":
-        return yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
-    return json.dumps(data, indent=2, ensure_ascii=False)
+        return safe_dump_yaml(data, sort_keys=False, allow_unicode=True)
+    return json_dumps_pretty(data)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -174,13 +295,13 @@ def main(argv: list[str] | None = None) -> int:
     ns = parser.parse_args(argv)
 
     try:
-        _, spec = load_openapi_spec(sut_name=ns.sut_name)
+        spec_path = resolve_openapi_spec_path(sut_name=ns.sut_name)
         if ns.cmd == "list":
-            ops = list_operations(spec, query=ns.query, limit=ns.limit)
+            ops = list_operations_from_file(spec_path, query=ns.query, limit=ns.limit)
             print(_dump({"operations": ops}, ns.format))
             return 0
         if ns.cmd == "extract":
-            data = extract_operation(spec, ns.operation_id)
+            data = extract_operation_from_file(spec_path, ns.operation_id)
             print(_dump(data, ns.format))
             return 0
     except Exception as e:
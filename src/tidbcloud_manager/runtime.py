@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import functools
+import json
 import os
 import re
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+
+# Shared read-only fallbacks for `.get(...) or ...` lookups; never mutate them or hand them out in results.
+_EMPTY_DICT: dict = {}
+_EMPTY_LIST: list = []
 
 _ENV_PATTERN = re.compile(r"\$\{([A-Z0-9_]+)(?::-([^}]*))?\}")
 
@@ -26,10 +38,18 @@ def canonical_sut_name(sut_name: str | None) -> str:
 def resolve_skill_root(start: Path | None = None) -> Path:
     explicit = os.environ.get("TIDBCLOUD_MANAGER_SKILL_DIR") or os.environ.get("SKILL_DIR")
     if explicit:
-        root = Path(explicit).expanduser().resolve()
-        return root
+        return _resolve_explicit_root(explicit)
+    return _resolve_skill_root_from(str(start or Path.cwd()))
+
 
-    start_path = (start or Path.cwd()).resolve()
+@functools.lru_cache(maxsize=4)
+def _resolve_explicit_root(explicit: str) -> Path:
+    return Path(explicit).expanduser().resolve()
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_skill_root_from(start: str) -> Path:
+    start_path = Path(start).resolve()
     # Common repo-root layout: run from repo root and keep the skill under .codex/skills/.
     repo_skill = start_path / ".codex" / "skills" / "tidbcloud-manager"
     if (repo_skill / "configs").is_dir():
@@ -53,7 +73,13 @@ def resolve_skill_root(start: Path | None = None) -> Path:
     )
 
 
+# Skill roots whose .env was already applied in this process (load_dotenv never overrides, so once is enough).
+_DOTENV_LOADED: set[Path] = set()
+
+
 def load_dotenv_from(root: Path) -> None:
+    if root in _DOTENV_LOADED:
+        return
     try:
         from dotenv import load_dotenv  # type: ignore
     except Exception:
@@ -62,21 +88,185 @@ def load_dotenv_from(root: Path) -> None:
     env_file = root / ".env"
     if env_file.exists():
         load_dotenv(env_file, override=False)
+    _DOTENV_LOADED.add(root)
 
 
-def expand_env_vars(obj: Any) -> Any:
+def safe_load_yaml(stream: Any) -> Any:
+    """yaml.safe_load, using the libyaml C loader when PyYAML was built with it."""
+    import yaml
+
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def safe_dump_yaml(data: Any, stream: Any = None, **kwargs: Any) -> Any:
+    """yaml.safe_dump, using the libyaml C dumper when PyYAML was built with it."""
+    import yaml
+
+    return yaml.dump(data, stream, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), **kwargs)
+
+
+# Parsed (not yet env-expanded) sut.yaml documents keyed by (path, mtime_ns, size).
+_SUT_CONFIG_CACHE: dict[tuple[str, int, int], Any] = {}
+_SUT_CONFIG_CACHE_MAX = 32
+
+
+def load_sut_config(config_dir: Path) -> dict:
+    """Load and env-expand `<config_dir>/sut.yaml`, parsing each file version once per process."""
+    sut_file = config_dir / "sut.yaml"
+    try:
+        st = sut_file.stat()
+    except FileNotFoundError:
+        return {}
+
+    key = (str(sut_file), st.st_mtime_ns, st.st_size)
+    data = _SUT_CONFIG_CACHE.get(key)
+    if data is None:
+        data = safe_load_yaml(sut_file.read_bytes()) or {}
+        if len(_SUT_CONFIG_CACHE) >= _SUT_CONFIG_CACHE_MAX:
+            _SUT_CONFIG_CACHE.pop(next(iter(_SUT_CONFIG_CACHE)))
+        _SUT_CONFIG_CACHE[key] = data
+    # Expansion runs on every call (the environment may have changed) and rebuilds every container,
+    # so callers never share the cached tree.
+    return expand_env_vars(data)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """json.loads, using orjson when installed; stdlib json still reports errors for invalid input."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def json_dumps_pretty_bytes(obj: Any) -> bytes:
+    """UTF-8 encoded json_dumps_pretty, without the str round-trip when orjson is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def json_dumps_pretty(obj: Any) -> str:
+    """json.dumps(obj, indent=2, ensure_ascii=False), using orjson when installed and the value allows it."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def emit_json(obj: Any) -> None:
+    """Print json_dumps_pretty(obj) to stdout, handing orjson's bytes straight to the binary buffer."""
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        print(json_dumps_pretty(obj))
+        return
+    out.flush()
+    buffer.write(json_dumps_pretty_bytes(obj) + b"\n")
+    buffer.flush()
+
+
+def _env_sub(m: re.Match[str]) -> str:
+    key = m.group(1)
+    default = m.group(2)
+    value = os.environ.get(key)
+    if value is None or value == "":
+        return default or ""
+    return value
+
+
+def expand_env_str(value: str) -> str:
+    if "${" not in value:
+        return value
+    return _ENV_PATTERN.sub(_env_sub, value)
+
+
+def map_string_leaves(obj: Any, fn: Callable[[str], str]) -> Any:
+    """Return a copy of a JSON-like tree with every string leaf passed through `fn`.
+
+    Walks iteratively (request bodies and configs can nest deeply); dicts and lists are always rebuilt,
+    other leaves are shared.
+    """
+    if isinstance(obj, str):
+        return fn(obj)
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    root: Any = {} if isinstance(obj, dict) else []
+    stack: list[tuple[Any, Any]] = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        is_dict = isinstance(dst, dict)
+        for k, v in (src.items() if is_dict else enumerate(src)):
+            if isinstance(v, str):
+                v = fn(v)
+            elif isinstance(v, dict):
+                child: Any = {}
+                stack.append((v, child))
+                v = child
+            elif isinstance(v, list):
+                child = []
+                stack.append((v, child))
+                v = child
+            if is_dict:
+                dst[k] = v
+            else:
+                dst.append(v)
+    return root
+
+
+def map_string_leaves_shared(obj: Any, fn: Callable[[str], str]) -> Any:
+    """Like `map_string_leaves`, but containers whose subtree `fn` left untouched are returned as-is.
+
+    The result may share dicts and lists with `obj`, so callers must not mutate it in place.
+    """
     if isinstance(obj, str):
-        def _repl(m: re.Match[str]) -> str:
-            key = m.group(1)
-            default = m.group(2)
-            value = os.environ.get(key)
-            if value is None or value == "":
-                return default or ""
-            return value
-
-        return _ENV_PATTERN.sub(_repl, obj)
-    if isinstance(obj, dict):
-        return {k: expand_env_vars(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [expand_env_vars(v) for v in obj]
-    return obj
+        return fn(obj)
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    # Each frame: [source, items iterator, collected (key, value) pairs, changed, key awaiting a child]
+    stack: list[list[Any]] = [
+        [obj, iter(obj.items() if isinstance(obj, dict) else enumerate(obj)), [], False, None]
+    ]
+    while True:
+        frame = stack[-1]
+        acc = frame[2]
+        descended = False
+        for k, v in frame[1]:
+            if isinstance(v, str):
+                nv = fn(v)
+                if nv is not v and nv != v:
+                    frame[3] = True
+                    v = nv
+            elif isinstance(v, (dict, list)):
+                frame[4] = k
+                stack.append([v, iter(v.items() if isinstance(v, dict) else enumerate(v)), [], False, None])
+                descended = True
+                break
+            acc.append((k, v))
+        if descended:
+            continue
+
+        stack.pop()
+        src = frame[0]
+        if frame[3]:
+            result: Any = dict(acc) if isinstance(src, dict) else [v for _, v in acc]
+        else:
+            result = src
+        if not stack:
+            return result
+        parent = stack[-1]
+        parent[2].append((parent[4], result))
+        if frame[3]:
+            parent[3] = True
+
+
+def expand_env_vars(obj: Any) -> Any:
+    return map_string_leaves(obj, expand_env_str)
@@ -10,18 +10,142 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import subprocess
 import sys
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-
-import requests
-from requests.auth import HTTPDigestAuth
-import yaml
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .runtime import (
+    canonical_sut_name,
+    emit_json,
+    expand_env_vars,
+    json_dumps_pretty,
+    json_loads,
+    load_dotenv_from,
+    load_sut_config,
+    resolve_skill_root,
+)
+
+if TYPE_CHECKING:
+    import requests
+    from requests.auth import HTTPDigestAuth
+
+
+# CLI output beyond these sizes is drained (so the tool can exit normally) but not kept. Stdout keeps enough to
+# parse typical JSON responses; stderr is only ever reported truncated to 2000 chars.
+_MAX_CLI_STDOUT_BYTES = 4 * 1024 * 1024
+_MAX_CLI_STDERR_BYTES = 8 * 1024
+_CLI_READ_CHUNK = 64 * 1024
+
+
+def _drain_capped(stream, limit: int, out: list[bytes]) -> None:
+    kept = 0
+    for chunk in iter(lambda: stream.read(_CLI_READ_CHUNK), b""):
+        if kept < limit:
+            piece = chunk[: limit - kept]
+            out.append(piece)
+            kept += len(piece)
+    stream.close()
+
+
+def _feed_stdin(stream, data: bytes) -> None:
+    try:
+        stream.write(data)
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+def _run_capped(
+    cmd: list[str], *, env: dict, stdin: str | None, timeout: float
+) -> tuple[int, str, str]:
+    """subprocess.run(capture_output=True, text=True) equivalent that keeps only a bounded prefix of output."""
+    proc = subprocess.Popen(
+        cmd,
+        # Without input the tool inherits our stdin, as subprocess.run(input=None) did (interactive prompts).
+        stdin=subprocess.PIPE if stdin is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    out_chunks: list[bytes] = []
+    err_chunks: list[bytes] = []
+    workers = [
+        threading.Thread(target=_drain_capped, args=(proc.stdout, _MAX_CLI_STDOUT_BYTES, out_chunks), daemon=True),
+        threading.Thread(target=_drain_capped, args=(proc.stderr, _MAX_CLI_STDERR_BYTES, err_chunks), daemon=True),
+    ]
+    if stdin is not None:
+        workers.append(threading.Thread(target=_feed_stdin, args=(proc.stdin, stdin.encode("utf-8")), daemon=True))
+    for w in workers:
+        w.start()
+
+    # One deadline covers both the process and its pipes: a background grandchild can keep stdout/stderr open
+    # after the direct child exits, like communicate(timeout=).
+    deadline = time.monotonic() + timeout
+    try:
+        returncode = proc.wait(timeout=timeout)
+        for w in workers:
+            w.join(max(0.0, deadline - time.monotonic()))
+            if w.is_alive():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+    except subprocess.TimeoutExpired:
+        # The readers are daemon threads; they exit once whatever still holds the pipes goes away.
+        proc.kill()
+        proc.wait()
+        raise
+
+    # Match text=True's universal-newline decoding.
+    stdout = _decode_text(b"".join(out_chunks))
+    stderr = _decode_text(b"".join(err_chunks))
+    return returncode, stdout, stderr
+
+
+def _decode_text(data: bytes) -> str:
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _compile_expect(expect: str) -> Callable[[dict], bool]:
+    """
+    Minimal CEL-like evaluator, intentionally tiny:
+    - Supports "body.foo == 'BAR'" or "body.foo == BAR"
+
+    Parses the expression once and returns a predicate over the response body, so polling loops don't re-parse it.
+    """
+    if not expect:
+        return lambda body: True
+
+    expr = expect.strip()
+    if "==" not in expr:
+        return lambda body: False
+
+    left, right = [p.strip() for p in expr.split("==", 1)]
+    if not left.startswith("body."):
+        return lambda body: False
+
+    path = tuple(left[5:].split("."))
+    expected = right.strip().strip("'").strip('"')
+
+    def _match(body: dict) -> bool:
+        current: object = body
+        for part in path:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return False
+        return str(current) == expected
 
-from .runtime import canonical_sut_name, expand_env_vars, load_dotenv_from, resolve_skill_root
+    return _match
 
 
 @dataclass
@@ -34,18 +158,17 @@ class ExecutionResult:
     error: Optional[str]
     duration_ms: int
 
+    def to_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "status_code": self.status_code,
+            "body": self.body,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+        }
+
     def to_json(self) -> str:
-        return json.dumps(
-            {
-                "success": self.success,
-                "status_code": self.status_code,
-                "body": self.body,
-                "error": self.error,
-                "duration_ms": self.duration_ms,
-            },
-            indent=2,
-            ensure_ascii=False,
-        )
+        return json_dumps_pretty(self.to_dict())
 
 
 class SecureExecutor:
@@ -60,13 +183,11 @@ class SecureExecutor:
         self.sut_config = self._load_sut_config()
         self.credentials = self._load_credentials()
 
+        # Created on first HTTP call so CLI-only use never imports requests.
+        self._http: Optional[requests.Session] = None
+
     def _load_sut_config(self) -> dict:
-        sut_file = self.config_dir / "sut.yaml"
-        if sut_file.exists():
-            with open(sut_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            return expand_env_vars(data)
-        return {}
+        return load_sut_config(self.config_dir)
 
     def _load_credentials(self) -> dict:
         """
@@ -102,7 +223,21 @@ class SecureExecutor:
 
         return creds
 
+    def _http_session(self) -> requests.Session:
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            # Reuse connections (keep-alive) across requests, notably between poll attempts.
+            self._http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            self._http.mount("https://", adapter)
+            self._http.mount("http://", adapter)
+        return self._http
+
     def _get_auth(self) -> Optional[HTTPDigestAuth]:
+        from requests.auth import HTTPDigestAuth
+
         auth_type = self.sut_config.get("connection", {}).get("auth", {}).get("type", "digest")
 
         if auth_type == "digest":
@@ -124,6 +259,8 @@ class SecureExecutor:
         return f"https://{host}{base_path}{path}"
 
     def execute_http(self, request: dict) -> ExecutionResult:
+        import requests
+
         request = expand_env_vars(request)
         method = request.get("method", "GET").upper()
         path = request.get("path", "")
@@ -140,7 +277,7 @@ class SecureExecutor:
         start_time = time.time()
 
         try:
-            response = requests.request(
+            response = self._http_session().request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -153,8 +290,8 @@ class SecureExecutor:
             duration_ms = int((time.time() - start_time) * 1000)
 
             try:
-                response_body = response.json() if response.content else {}
-            except json.JSONDecodeError:
+                response_body = json_loads(response.content) if response.content else {}
+            except ValueError:
                 response_body = {"raw": response.text[:1000]}
 
             success = 200 <= response.status_code < 300
@@ -241,24 +378,17 @@ class SecureExecutor:
                             continue
                         run_env[str(k)] = str(v)
 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=60,
-                    input=tool_stdin,
-                    env=run_env,
-                )
+                returncode, stdout, stderr = _run_capped(cmd, env=run_env, stdin=tool_stdin, timeout=60)
                 duration_ms = int((time.time() - start_time) * 1000)
 
-                stdout = (result.stdout or "").strip()
-                stderr = (result.stderr or "").strip()
-                success = result.returncode == 0
+                stdout = stdout.strip()
+                stderr = stderr.strip()
+                success = returncode == 0
 
                 body: dict
                 if stdout:
                     try:
-                        body = json.loads(stdout)
+                        body = json_loads(stdout)
                     except json.JSONDecodeError:
                         body = {"stdout": stdout[:2000]}
                 else:
@@ -269,9 +399,9 @@ class SecureExecutor:
 
                 return ExecutionResult(
                     success=success,
-                    status_code=result.returncode,
+                    status_code=returncode,
                     body=body,
-                    error=None if success else f"Exit {result.returncode}",
+                    error=None if success else f"Exit {returncode}",
                     duration_ms=duration_ms,
                 )
             except FileNotFoundError as e:
@@ -324,44 +454,39 @@ class SecureExecutor:
     def poll_until_ready(
         self, request: dict, expect_cel: str, max_retries: int = 60, delay_seconds: int = 30
     ) -> ExecutionResult:
+        matches = _compile_expect(expect_cel)
         last: Optional[ExecutionResult] = None
-        for _ in range(max_retries):
+        if max_retries <= 0:
+            return ExecutionResult(
+                success=False, status_code=None, body={}, error="No attempts executed", duration_ms=0
+            )
+
+        # Callers size the wait as max_retries x delay_seconds. Backoff polls more often early on, so keep going
+        # until both that window has passed and max_retries polls were made.
+        deadline = time.monotonic() + (max_retries - 1) * delay_seconds
+        attempt = 0
+        while True:
             last = self.execute_http(request)
-            if last.success and self._evaluate_expect(last.body, expect_cel):
+            if last.success and matches(last.body):
                 return last
-            time.sleep(delay_seconds)
+            attempt += 1
+            remaining = deadline - time.monotonic()
+            if attempt >= max_retries and remaining <= 0:
+                break
+            delay = self._poll_delay(attempt - 1, delay_seconds)
+            time.sleep(min(delay, remaining) if remaining > 0 else delay)
         return last or ExecutionResult(
             success=False, status_code=None, body={}, error="No attempts executed", duration_ms=0
         )
 
-    def _evaluate_expect(self, body: dict, expect: str) -> bool:
-        """
-        Minimal CEL-like evaluator, intentionally tiny:
-        - Supports "body.foo == 'BAR'" or "body.foo == BAR"
-        """
-        if not expect:
-            return True
-
-        expr = expect.strip()
-        if "==" not in expr:
-            return False
-
-        left, right = [p.strip() for p in expr.split("==", 1)]
-        if left.startswith("body."):
-            path = left[5:]
-        else:
-            return False
-
-        expected = right.strip().strip("'").strip('"')
+    @staticmethod
+    def _poll_delay(attempt: int, delay_seconds: float) -> float:
+        """Exponential backoff (1s, 2s, 4s, ...) capped at delay_seconds, with up to 10% jitter."""
+        base = min(float(delay_seconds), float(2 ** min(attempt, 16)))
+        return base + random.uniform(0, base * 0.1)
 
-        current: object = body
-        for part in path.split("."):
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return False
-
-        return str(current) == expected
+    def _evaluate_expect(self, body: dict, expect: str) -> bool:
+        return _compile_expect(expect)(body)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -416,7 +541,7 @@ def main(argv: list[str] | None = None) -> int:
         print(json.dumps({"success": False, "error": f"Unknown command: {command}. Use http, cli, or poll."}))
         return 1
 
-    print(result.to_json())
+    emit_json(result.to_dict())
     return 0 if result.success else 1
 
 
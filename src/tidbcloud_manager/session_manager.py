@@ -16,30 +16,64 @@ This module provides:
 
 from __future__ import annotations
 
+import atexit
+import functools
 import json
+import os
 import re
 import sys
+import time
 import uuid
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
-
-import yaml
-
-from .runtime import canonical_sut_name, expand_env_vars, load_dotenv_from, resolve_skill_root
+from typing import Any, Callable, Optional
+
+from .runtime import (
+    canonical_sut_name,
+    emit_json,
+    expand_env_str,
+    json_dumps_pretty_bytes,
+    json_loads,
+    load_dotenv_from,
+    load_sut_config,
+    map_string_leaves_shared,
+    resolve_skill_root,
+    safe_dump_yaml,
+    safe_load_yaml,
+)
 from .secure_executor import ExecutionResult, SecureExecutor
 
 
 _SENSITIVE_KEY_RE = re.compile(r"(password|private[_-]?key|token|secret|pwd)", re.IGNORECASE)
 _PLACEHOLDER_VALUE_RE = re.compile(r"^\{[A-Za-z0-9_]+\}$")
+_PLACEHOLDER_RE = re.compile(r"\{([^}]+)\}")
+_ASCII_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_ASCII_LOWER_OR_DIGIT = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+_ASCII_ALNUM = _ASCII_UPPER | _ASCII_LOWER_OR_DIGIT
 
 
+@functools.lru_cache(maxsize=4096)
 def _to_placeholder_name(key: str) -> str:
-    key = re.sub(r"[^A-Za-z0-9]+", "_", key)
-    key = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", key)
-    key = key.strip("_").lower()
-    return key or "redacted"
+    # One pass: runs of non-[A-Za-z0-9] collapse to "_", and "_" splits camelCase ("rootPassword" -> "root_password").
+    out: list[str] = []
+    prev = ""
+    for c in key:
+        if c in _ASCII_ALNUM:
+            if c in _ASCII_UPPER and prev in _ASCII_LOWER_OR_DIGIT:
+                out.append("_")
+            out.append(c)
+            prev = c
+        elif prev != "_":
+            out.append("_")
+            prev = "_"
+    return "".join(out).strip("_").lower() or "redacted"
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_sensitive_key(key: str) -> bool:
+    # Sessions repeat the same handful of keys across every request/response, so cache the regex verdict.
+    return _SENSITIVE_KEY_RE.search(key) is not None
 
 
 def redact_sensitive_values(obj: Any) -> Any:
@@ -51,23 +85,129 @@ def redact_sensitive_values(obj: Any) -> Any:
       like "{root_password}" so outputs stay reusable without leaking real values.
     - If the value already looks like a placeholder (e.g. "{root_password}"), keep it.
     """
-    if isinstance(obj, dict):
-        out: dict[Any, Any] = {}
-        for k, v in obj.items():
-            if isinstance(k, str) and _SENSITIVE_KEY_RE.search(k):
-                if isinstance(v, str) and _PLACEHOLDER_VALUE_RE.match(v):
-                    out[k] = v
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    # Iterative rebuild: attempt histories can be large and deeply nested.
+    root: Any = {} if isinstance(obj, dict) else []
+    stack: list[tuple[Any, Any]] = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        is_dict = isinstance(dst, dict)
+        for k, v in (src.items() if is_dict else enumerate(src)):
+            if is_dict and isinstance(k, str) and _is_sensitive_key(k):
+                if isinstance(v, str) and v[:1] == "{" and _PLACEHOLDER_VALUE_RE.match(v):
+                    dst[k] = v
                 else:
-                    out[k] = "{" + _to_placeholder_name(k) + "}"
+                    dst[k] = "{" + _to_placeholder_name(k) + "}"
                 continue
-            out[k] = redact_sensitive_values(v)
-        return out
-    if isinstance(obj, list):
-        return [redact_sensitive_values(v) for v in obj]
-    return obj
+            if isinstance(v, dict):
+                child: Any = {}
+                stack.append((v, child))
+                v = child
+            elif isinstance(v, list):
+                child = []
+                stack.append((v, child))
+                v = child
+            if is_dict:
+                dst[k] = v
+            else:
+                dst.append(v)
+    return root
 
 
-@dataclass
+@functools.lru_cache(maxsize=1024)
+def _compile_eval_path(path: str) -> tuple[str | int, ...]:
+    """
+    Tokenize an eval path like 'a.b[0].c' into ('a', 'b', 0, 'c').
+
+    Cached: the same save_config paths are evaluated on every execute/rerun. Chained indexes ('a[0][1]') are
+    supported; a malformed index raises ValueError as before.
+    """
+    parts: list[str | int] = []
+    for segment in path.split("."):
+        bracket = segment.find("[")
+        if bracket < 0:
+            parts.append(segment)
+            continue
+        if bracket:
+            parts.append(segment[:bracket])
+        while bracket >= 0:
+            close = segment.index("]", bracket)
+            parts.append(int(segment[bracket + 1 : close]))
+            bracket = segment.find("[", close)
+    return tuple(parts)
+
+
+# Draft/final YAML files are written fragment by fragment; coalesce those into larger writes.
+_YAML_WRITE_BUFFER = 64 * 1024
+
+_ISO_SECOND: tuple[int, str] = (-1, "")
+
+
+def _iso_now() -> str:
+    """Local-time `datetime.now().isoformat()` equivalent; the seconds prefix is reused within a second."""
+    global _ISO_SECOND
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    last, prefix = _ISO_SECOND
+    if sec != last:
+        tm = time.localtime(sec)
+        prefix = (
+            f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+        )
+        _ISO_SECOND = (sec, prefix)
+    # isoformat() drops the fraction entirely when it is zero.
+    return f"{prefix}.{us:06d}" if us else prefix
+
+
+def _save_every_from_env() -> int:
+    try:
+        return max(1, int(os.environ.get("TIDBCLOUD_SAVE_EVERY", "1")))
+    except ValueError:
+        return 1
+
+
+# Sessions holding attempts not yet written to disk (TIDBCLOUD_SAVE_EVERY > 1), keyed by absolute session file
+# path. At most one instance per file may be pending, so a stale instance can't overwrite a newer one at exit.
+_PENDING_SESSIONS: dict[str, "SessionManager"] = {}
+
+
+def _flush_pending_sessions() -> None:
+    pending = list(_PENDING_SESSIONS.values())
+    _PENDING_SESSIONS.clear()
+    for session in pending:
+        session.flush()
+
+
+def _mark_pending(session: "SessionManager") -> None:
+    key = os.path.abspath(session.session_file)
+    other = _PENDING_SESSIONS.get(key)
+    if other is session:
+        return
+    if other is not None:
+        other.flush()
+    if not _PENDING_SESSIONS:
+        atexit.register(_flush_pending_sessions)
+    _PENDING_SESSIONS[key] = session
+
+
+def _flush_pending_for(session_file: str | Path) -> None:
+    """Write out any pending instance of this session before it is read from disk."""
+    pending = _PENDING_SESSIONS.get(os.path.abspath(session_file))
+    if pending is not None:
+        pending.flush()
+
+
+def _clear_pending(session: "SessionManager") -> None:
+    key = os.path.abspath(session.session_file)
+    if _PENDING_SESSIONS.get(key) is session:
+        del _PENDING_SESSIONS[key]
+        if not _PENDING_SESSIONS:
+            atexit.unregister(_flush_pending_sessions)
+
+
+@dataclass(slots=True)
 class Attempt:
     """A single execution attempt (success or failure)."""
 
@@ -83,12 +223,28 @@ class Attempt:
     duration_ms: int
     saved_variables: dict = field(default_factory=dict)  # Variables extracted from this attempt (values)
     save_config: Optional[dict] = None  # Original save config (eval paths), for YAML generation
+    # Placeholder names used by `request`; set by execute() or lazily by summary(), never persisted.
+    required_variables: Optional[frozenset[str]] = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Shallow: nested request/response dicts are shared with the attempt.
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "operation_id": self.operation_id,
+            "request_type": self.request_type,
+            "request": self.request,
+            "resolved_request": self.resolved_request,
+            "response": self.response,
+            "success": self.success,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+            "saved_variables": self.saved_variables,
+            "save_config": self.save_config,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Step:
     """A step in the final YAML (success attempts only, cleaned up)."""
 
@@ -118,6 +274,15 @@ class Step:
         return d
 
 
+@dataclass
+class _RenderedAttempt:
+    """Per-attempt persistence cache: the redacted dict and, once rendered, its UTF-8 draft YAML fragment."""
+
+    attempt: Attempt
+    redacted: dict
+    draft_yaml: Optional[bytes] = None
+
+
 class SessionManager:
     """Manages an E2E exploration session."""
 
@@ -128,73 +293,109 @@ class SessionManager:
         session_id: Optional[str] = None,
         *,
         skill_root: Path | None = None,
+        defer_config: bool = False,
     ):
+        """
+        With `defer_config=True` (used by `load`), sut.yaml and the executor are only set up on first use and the
+        output directory is assumed to exist.
+        """
         self.session_id = session_id or f"ses_{uuid.uuid4().hex[:12]}"
         self.sut_name = canonical_sut_name(sut_name)
         self.scenario_name = scenario_name
-        self.created_at = datetime.now().isoformat()
+        self.created_at = _iso_now()
         self.updated_at = self.created_at
 
         self.skill_root = skill_root or resolve_skill_root()
         load_dotenv_from(self.skill_root)
 
         self.output_dir = self.skill_root / "output"
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not defer_config:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
         self.session_file = self.output_dir / f".session_{self.session_id}.json"
         self.draft_yaml_file = self.output_dir / f".draft_{self.scenario_name}.yaml"
         self.final_yaml_file = self.output_dir / f"{self.scenario_name}.yaml"
 
         self.config_dir = self.skill_root / "configs" / self.sut_name
-        self.sut_config = self._load_sut_config()
 
+        # Read freely, but change it only via set_variable() or by assigning a new dict: save()/status() reuse a
+        # redacted copy that in-place edits (`variables[k] = v`, `.update()`) would leave stale.
         self.variables: dict[str, Any] = {}
         self.attempts: list[Attempt] = []
+        self._rendered_attempts: list[_RenderedAttempt] = []
+
+        if not defer_config:
+            self.sut_config = self._load_sut_config()
+            preset_vars = self.sut_config.get("preset_variables", {})
+            self.variables.update(preset_vars)
+            self.executor = SecureExecutor(self.sut_name, skill_root=self.skill_root)
 
-        preset_vars = self.sut_config.get("preset_variables", {})
-        self.variables.update(preset_vars)
+        # Bumped by set_variable(); see _redacted_variables().
+        self._variables_version = 0
+        self._redacted_variables_cache: Optional[tuple[dict, int, dict]] = None
 
-        self.executor = SecureExecutor(self.sut_name, skill_root=self.skill_root)
+        # Persist draft YAML + session file every N executes (default 1: after each one). With N > 1 pending
+        # attempts are flushed at interpreter exit, or when the same session is loaded again.
+        self._save_every = _save_every_from_env()
+        self._unsaved_attempts = 0
 
     def _load_sut_config(self) -> dict:
-        sut_file = self.config_dir / "sut.yaml"
-        if sut_file.exists():
-            with open(sut_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            return expand_env_vars(data)
-        return {}
+        return load_sut_config(self.config_dir)
+
+    @functools.cached_property
+    def sut_config(self) -> dict:
+        return self._load_sut_config()
+
+    @functools.cached_property
+    def executor(self) -> SecureExecutor:
+        return SecureExecutor(self.sut_name, skill_root=self.skill_root)
 
     # =========================================================================
     # Variable Substitution
     # =========================================================================
 
+    def _substituter(self) -> Callable[[str], str]:
+        # Stringify each value once per call rather than once per placeholder occurrence.
+        vars_str = {k: str(v) for k, v in self.variables.items()}
+
+        def _repl(m: re.Match[str]) -> str:
+            return vars_str.get(m.group(1), m.group(0))
+
+        def _substitute(value: str) -> str:
+            if "{" not in value:
+                return value
+            return _PLACEHOLDER_RE.sub(_repl, value)
+
+        return _substitute
+
     def substitute_variables(self, obj: Any) -> Any:
-        """Replace {placeholder} with actual values from self.variables."""
-        if isinstance(obj, str):
-            pattern = r"\{([^}]+)\}"
-            matches = re.findall(pattern, obj)
-            result = obj
-            for var_name in matches:
-                if var_name in self.variables:
-                    result = result.replace(f"{{{var_name}}}", str(self.variables[var_name]))
-            return result
-        if isinstance(obj, dict):
-            return {k: self.substitute_variables(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self.substitute_variables(item) for item in obj]
-        return obj
+        """Replace {placeholder} with actual values from self.variables.
+
+        Unchanged subtrees are shared with `obj` rather than copied.
+        """
+        return map_string_leaves_shared(obj, self._substituter())
+
+    def _resolve_request(self, request: Any) -> Any:
+        """`expand_env_vars(self.substitute_variables(request))` in a single walk."""
+        substitute = self._substituter()
+
+        def _resolve(value: str) -> str:
+            return expand_env_str(substitute(value))
+
+        return map_string_leaves_shared(request, _resolve)
 
     def find_required_variables(self, obj: Any) -> set[str]:
         """Find all {placeholder} references in a request."""
         required: set[str] = set()
-        if isinstance(obj, str):
-            pattern = r"\{([^}]+)\}"
-            required.update(re.findall(pattern, obj))
-        elif isinstance(obj, dict):
-            for v in obj.values():
-                required.update(self.find_required_variables(v))
-        elif isinstance(obj, list):
-            for item in obj:
-                required.update(self.find_required_variables(item))
+        stack = [obj]
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, str):
+                if "{" in cur:
+                    required.update(_PLACEHOLDER_RE.findall(cur))
+            elif isinstance(cur, dict):
+                stack.extend(cur.values())
+            elif isinstance(cur, list):
+                stack.extend(cur)
         return required
 
     # =========================================================================
@@ -210,7 +411,7 @@ class SessionManager:
             eval_path = eval_path[5:]
 
         current: Any = response
-        for part in self._parse_path(eval_path):
+        for part in _compile_eval_path(eval_path):
             if isinstance(part, int):
                 if isinstance(current, list) and len(current) > part:
                     current = current[part]
@@ -224,19 +425,6 @@ class SessionManager:
 
         return current
 
-    def _parse_path(self, path: str) -> list[Any]:
-        parts: list[Any] = []
-        for segment in path.split("."):
-            if "[" in segment:
-                base = segment[: segment.index("[")]
-                if base:
-                    parts.append(base)
-                idx_str = segment[segment.index("[") + 1 : segment.index("]")]
-                parts.append(int(idx_str))
-            else:
-                parts.append(segment)
-        return parts
-
     def extract_and_save(self, response: dict, save_config: Optional[dict]) -> dict:
         """
         Extract values from response and save to variables.
@@ -255,11 +443,16 @@ class SessionManager:
             if key and eval_path:
                 value = self.extract_value(response, eval_path)
                 if value is not None:
-                    self.variables[key] = value
+                    self.set_variable(key, value)
                     saved[key] = value
 
         return saved
 
+    def set_variable(self, key: str, value: Any) -> None:
+        """Set a session variable (keeps the redacted copy used by save()/status() in sync)."""
+        self.variables[key] = value
+        self._variables_version += 1
+
     # =========================================================================
     # Execution
     # =========================================================================
@@ -276,8 +469,7 @@ class SessionManager:
         if missing:
             print(f"Warning: Missing variables: {missing}", file=sys.stderr)
 
-        resolved_request = self.substitute_variables(request)
-        resolved_request = expand_env_vars(resolved_request)
+        resolved_request = self._resolve_request(request)
 
         if request_type == "http":
             result = self.executor.execute_http(resolved_request)
@@ -296,7 +488,7 @@ class SessionManager:
 
         attempt = Attempt(
             index=len(self.attempts),
-            timestamp=datetime.now().isoformat(),
+            timestamp=_iso_now(),
             operation_id=operation_id,
             request_type=request_type,
             request=request,
@@ -307,11 +499,15 @@ class SessionManager:
             duration_ms=result.duration_ms,
             saved_variables=saved_vars,
             save_config=save_config,
+            required_variables=frozenset(required),
         )
         self.attempts.append(attempt)
 
-        self._update_draft_yaml()
-        self.save()
+        self._unsaved_attempts += 1
+        if self._unsaved_attempts >= self._save_every:
+            self.flush()
+        else:
+            _mark_pending(self)
 
         return attempt
 
@@ -329,7 +525,7 @@ class SessionManager:
             "scenario": self.scenario_name,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
-            "variables": redact_sensitive_values(self.variables),
+            "variables": self._redacted_variables(),
             "attempts": {"total": len(self.attempts), "success": success_count, "failure": failure_count},
             "files": {
                 "session": str(self.session_file),
@@ -358,34 +554,34 @@ class SessionManager:
         saved_vars_chain: dict[str, int] = {}
         required_vars_chain: dict[str, list[int]] = {}
 
-        step_number = 0
-        for attempt in self.attempts:
-            if attempt.index in remove_set:
-                continue
-            if not attempt.success:
-                continue
-
-            step_number += 1
-
+        kept = [a for a in self.attempts if a.success and a.index not in remove_set]
+        operation_to_name = self._operation_to_name
+        for step_number, attempt in enumerate(kept, 1):
             for var_name in attempt.saved_variables:
                 saved_vars_chain[var_name] = step_number
 
-            required = self.find_required_variables(attempt.request)
+            required = attempt.required_variables
+            if required is None:
+                required = attempt.required_variables = frozenset(self.find_required_variables(attempt.request))
             for var_name in required:
-                required_vars_chain.setdefault(var_name, []).append(step_number)
-
-            step = Step(
-                name=f"step_{step_number}_{self._operation_to_name(attempt.operation_id)}",
-                operation_id=attempt.operation_id,
-                request_type=attempt.request_type,
-                request=redact_sensitive_values(attempt.request),
-                expect={"status_code": attempt.response.get("status_code", 200)},
-                save=attempt.save_config if attempt.save_config else None,
+                try:
+                    required_vars_chain[var_name].append(step_number)
+                except KeyError:
+                    required_vars_chain[var_name] = [step_number]
+
+            final_steps.append(
+                Step(
+                    name=f"step_{step_number}_{operation_to_name(attempt.operation_id)}",
+                    operation_id=attempt.operation_id,
+                    request_type=attempt.request_type,
+                    request=redact_sensitive_values(attempt.request),
+                    expect={"status_code": attempt.response.get("status_code", 200)},
+                    save=attempt.save_config if attempt.save_config else None,
+                )
             )
-            final_steps.append(step)
 
         validation_errors = []
-        preset = set((self.sut_config.get("preset_variables", {}) or {}).keys())
+        preset = self.sut_config.get("preset_variables", {}) or {}
         for var_name, step_indices in required_vars_chain.items():
             if var_name in preset:
                 continue
@@ -406,30 +602,41 @@ class SessionManager:
             "success_attempts": sum(1 for a in self.attempts if a.success),
             "removed_attempts": len(remove_set),
             "final_steps": len(final_steps),
-            "saved_variables": list(saved_vars_chain.keys()),
+            "saved_variables": list(saved_vars_chain),
             "validation_errors": validation_errors,
             "final_yaml": str(self.final_yaml_file),
         }
 
     def _operation_to_name(self, operation_id: str) -> str:
-        if "_" in operation_id:
-            parts = operation_id.split("_")
-            return "_".join(p.lower() for p in parts[1:])
-        return operation_id.lower()
+        _, sep, rest = operation_id.partition("_")
+        return rest.lower() if sep else operation_id.lower()
 
     def _generate_final_yaml(self, steps: list[Step]) -> None:
         conn = self.sut_config.get("connection", {})
-        output = {
+        header = {
             "scenario": {"name": self.scenario_name, "description": f"Auto-generated from session {self.session_id}"},
             "connection": {
                 "host": conn.get("host", ""),
                 "base_path": conn.get("base_path", ""),
                 "auth": {"type": conn.get("auth", {}).get("type", "digest")},
             },
-            "steps": [s.to_dict() for s in steps],
         }
-        with open(self.final_yaml_file, "w", encoding="utf-8") as f:
-            yaml.dump(output, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        dump_kwargs: dict[str, Any] = {
+            "default_flow_style": False,
+            "allow_unicode": True,
+            "sort_keys": False,
+            "encoding": "utf-8",
+        }
+        # Emit step by step (each as a one-item sequence, i.e. its text under `steps:`) instead of building one big
+        # document for the dumper.
+        with open(self.final_yaml_file, "wb", buffering=_YAML_WRITE_BUFFER) as f:
+            f.write(safe_dump_yaml(header, **dump_kwargs))
+            if steps:
+                f.write(b"steps:\n")
+                for step in steps:
+                    f.write(safe_dump_yaml([step.to_dict()], **dump_kwargs))
+            else:
+                f.write(b"steps: []\n")
 
     # =========================================================================
     # Rerun - Execute Final YAML
@@ -440,7 +647,7 @@ class SessionManager:
             return {"success": False, "error": "No final YAML file. Run summary first."}
 
         with open(self.final_yaml_file, "r", encoding="utf-8") as f:
-            yaml_data = yaml.safe_load(f) or {}
+            yaml_data = safe_load_yaml(f) or {}
 
         steps = yaml_data.get("steps", [])
 
@@ -473,7 +680,7 @@ class SessionManager:
                     )
                     attempt = Attempt(
                         index=len(rerun_session.attempts),
-                        timestamp=datetime.now().isoformat(),
+                        timestamp=_iso_now(),
                         operation_id=operation_id,
                         request_type=request_type,
                         request=request,
@@ -505,7 +712,7 @@ class SessionManager:
             if not attempt.success:
                 all_success = False
 
-        rerun_session.save()
+        rerun_session.flush()
 
         return {"success": all_success, "rerun_session_id": rerun_session.session_id, "steps": results, "variables": rerun_session.variables}
 
@@ -513,86 +720,100 @@ class SessionManager:
     # Draft YAML (all attempts, including failures)
     # =========================================================================
 
+    def _redacted_variables(self) -> dict:
+        """
+        redact_sensitive_values(self.variables), recomputed only when the variables change.
+
+        Valid while `self.variables` is the same dict at the same version; the result is shared, so don't mutate it.
+        """
+        cached = self._redacted_variables_cache
+        if cached is None or cached[0] is not self.variables or cached[1] != self._variables_version:
+            cached = (self.variables, self._variables_version, redact_sensitive_values(self.variables))
+            self._redacted_variables_cache = cached
+        return cached[2]
+
+    def _rendered(self) -> list[_RenderedAttempt]:
+        """
+        Redacted form of every attempt, computed once per attempt.
+
+        Attempts are append-only, so only new ones are redacted; the cache is keyed by identity to stay correct
+        if `self.attempts` is replaced.
+        """
+        cache = self._rendered_attempts
+        keep = 0
+        while keep < len(cache) and keep < len(self.attempts) and cache[keep].attempt is self.attempts[keep]:
+            keep += 1
+        del cache[keep:]
+        for attempt in self.attempts[keep:]:
+            redacted = redact_sensitive_values(attempt.to_dict())
+            cache.append(_RenderedAttempt(attempt=attempt, redacted=redacted))
+        return cache
+
     def _update_draft_yaml(self) -> None:
         conn = self.sut_config.get("connection", {})
 
-        steps = []
-        for attempt in self.attempts:
-            safe_attempt = redact_sensitive_values(
-                {
-                    "index": attempt.index,
-                    "timestamp": attempt.timestamp,
-                    "operation_id": attempt.operation_id,
-                    "request_type": attempt.request_type,
-                    "request": attempt.request,
-                    "resolved_request": attempt.resolved_request,
-                    "response": attempt.response,
-                    "success": attempt.success,
-                    "error": attempt.error,
-                    "duration_ms": attempt.duration_ms,
-                    "saved_variables": attempt.saved_variables,
-                    "save_config": attempt.save_config,
-                }
-            )
-            steps.append(
-                {
-                    "index": safe_attempt["index"],
-                    "timestamp": safe_attempt["timestamp"],
-                    "operation_id": safe_attempt["operation_id"],
-                    "request_type": safe_attempt["request_type"],
-                    "request": safe_attempt["request"],
-                    "resolved_request": safe_attempt["resolved_request"],
-                    "response": safe_attempt["response"],
-                    "success": safe_attempt["success"],
-                    "error": safe_attempt["error"],
-                    "duration_ms": safe_attempt["duration_ms"],
-                    "saved_variables": safe_attempt["saved_variables"],
-                    "save_config": safe_attempt["save_config"],
-                }
-            )
+        rendered = self._rendered()
+        for entry in rendered:
+            if entry.draft_yaml is None:
+                # Dumped as a one-item sequence: the same text it takes as an item of the top-level `attempts:` list.
+                entry.draft_yaml = safe_dump_yaml(
+                    [entry.redacted], default_flow_style=False, allow_unicode=True, sort_keys=False, encoding="utf-8"
+                )
 
-        output = {
+        header = {
             "session": {"id": self.session_id, "sut": self.sut_name, "scenario": self.scenario_name, "created_at": self.created_at},
             "connection": {"host": conn.get("host", ""), "base_path": conn.get("base_path", "")},
-            "variables": redact_sensitive_values(self.variables),
-            "attempts": steps,
+            "variables": self._redacted_variables(),
         }
-
-        with open(self.draft_yaml_file, "w", encoding="utf-8") as f:
-            yaml.dump(output, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        with open(self.draft_yaml_file, "wb", buffering=_YAML_WRITE_BUFFER) as f:
+            f.write(safe_dump_yaml(header, default_flow_style=False, allow_unicode=True, sort_keys=False, encoding="utf-8"))
+            if rendered:
+                f.write(b"attempts:\n")
+                for entry in rendered:
+                    f.write(entry.draft_yaml or b"")
+            else:
+                f.write(b"attempts: []\n")
 
     # =========================================================================
     # Save/Load Session
     # =========================================================================
 
+    def flush(self) -> str:
+        """Write the draft YAML (if attempts are pending) and the session file."""
+        if self._unsaved_attempts:
+            self._update_draft_yaml()
+            self._unsaved_attempts = 0
+        _clear_pending(self)
+        return self.save()
+
     def save(self) -> str:
-        self.updated_at = datetime.now().isoformat()
-        data = redact_sensitive_values(
-            {
-                "session_id": self.session_id,
-                "sut_name": self.sut_name,
-                "scenario_name": self.scenario_name,
-                "created_at": self.created_at,
-                "updated_at": self.updated_at,
-                "variables": self.variables,
-                "attempts": [a.to_dict() for a in self.attempts],
-            }
-        )
-        with open(self.session_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self.updated_at = _iso_now()
+        data = {
+            "session_id": self.session_id,
+            "sut_name": self.sut_name,
+            "scenario_name": self.scenario_name,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "variables": self._redacted_variables(),
+            "attempts": [entry.redacted for entry in self._rendered()],
+        }
+        self.session_file.write_bytes(json_dumps_pretty_bytes(data))
         return str(self.session_file)
 
     @classmethod
     def load(cls, session_file: str, *, skill_root: Path | None = None) -> "SessionManager":
-        with open(session_file, "r", encoding="utf-8") as f:
-            data = json.load(f) or {}
+        _flush_pending_for(session_file)
+        data = json_loads(Path(session_file).read_bytes()) or {}
 
         session = cls(
             sut_name=data["sut_name"],
             scenario_name=data["scenario_name"],
             session_id=data["session_id"],
             skill_root=skill_root,
+            defer_config=True,
         )
+        if Path(session_file).parent != session.output_dir:
+            session.output_dir.mkdir(parents=True, exist_ok=True)
         session.created_at = data.get("created_at", session.created_at)
         session.updated_at = data.get("updated_at", session.updated_at)
         session.variables = data.get("variables", {}) or {}
@@ -605,6 +826,7 @@ class SessionManager:
         load_dotenv_from(root)
         output_dir = root / "output"
         session_file = output_dir / f".session_{session_id}.json"
+        _flush_pending_for(session_file)
         if session_file.exists():
             return cls.load(str(session_file), skill_root=root)
         return None
@@ -613,21 +835,18 @@ class SessionManager:
 def main(argv: list[str] | None = None) -> int:
     argv = list(sys.argv[1:] if argv is None else argv)
     if len(argv) < 1:
-        print(
-            json.dumps(
-                {
-                    "success": False,
-                    "error": "Usage: tidbcloud-manager session <command> [args]",
-                    "commands": {
-                        "new": "new <sut_name> <scenario_name>",
-                        "execute": "execute <session_id> <operation_id> '<request_json>' ['<save_json>'] [request_type]",
-                        "status": "status <session_id>",
-                        "summary": "summary <session_id> [--remove <index>]...",
-                        "rerun": "rerun <session_id>",
-                    },
+        emit_json(
+            {
+                "success": False,
+                "error": "Usage: tidbcloud-manager session <command> [args]",
+                "commands": {
+                    "new": "new <sut_name> <scenario_name>",
+                    "execute": "execute <session_id> <operation_id> '<request_json>' ['<save_json>'] [request_type]",
+                    "status": "status <session_id>",
+                    "summary": "summary <session_id> [--remove <index>]...",
+                    "rerun": "rerun <session_id>",
                 },
-                indent=2,
-            )
+            },
         )
         return 1
 
@@ -641,11 +860,8 @@ def main(argv: list[str] | None = None) -> int:
             scenario_name = argv[2]
             session = SessionManager(sut_name, scenario_name)
             session.save()
-            print(
-                json.dumps(
-                    {"success": True, "session_id": session.session_id, "session_file": str(session.session_file), "variables": session.variables},
-                    indent=2,
-                )
+            emit_json(
+                {"success": True, "session_id": session.session_id, "session_file": str(session.session_file), "variables": session.variables},
             )
             return 0
 
@@ -672,21 +888,18 @@ def main(argv: list[str] | None = None) -> int:
                 return 1
 
             attempt = session.execute(operation_id, request, save_config, request_type)
-            print(
-                json.dumps(
-                    {
-                        "success": attempt.success,
-                        "attempt_index": attempt.index,
-                        "operation_id": attempt.operation_id,
-                        "status_code": attempt.response.get("status_code"),
-                        "body": attempt.response.get("body", {}),
-                        "error": attempt.error,
-                        "duration_ms": attempt.duration_ms,
-                        "saved_variables": attempt.saved_variables,
-                        "all_variables": session.variables,
-                    },
-                    indent=2,
-                )
+            emit_json(
+                {
+                    "success": attempt.success,
+                    "attempt_index": attempt.index,
+                    "operation_id": attempt.operation_id,
+                    "status_code": attempt.response.get("status_code"),
+                    "body": attempt.response.get("body", {}),
+                    "error": attempt.error,
+                    "duration_ms": attempt.duration_ms,
+                    "saved_variables": attempt.saved_variables,
+                    "all_variables": session.variables,
+                },
             )
             return 0 if attempt.success else 1
 
@@ -699,7 +912,7 @@ def main(argv: list[str] | None = None) -> int:
             if not session:
                 print(json.dumps({"success": False, "error": f"Session not found: {session_id}"}))
                 return 1
-            print(json.dumps(session.status(), indent=2))
+            emit_json(session.status())
             return 0
 
         if command == "summary":
@@ -723,7 +936,7 @@ def main(argv: list[str] | None = None) -> int:
                 return 1
 
             result = session.summary(remove_indices if remove_indices else None)
-            print(json.dumps(result, indent=2))
+            emit_json(result)
             return 0
 
         if command == "rerun":
@@ -736,7 +949,7 @@ def main(argv: list[str] | None = None) -> int:
                 print(json.dumps({"success": False, "error": f"Session not found: {session_id}"}))
                 return 1
             result = session.rerun()
-            print(json.dumps(result, indent=2))
+            emit_json(result)
             return 0 if result.get("success") else 1
 
         print(json.dumps({"success": False, "error": f"Unknown command: {command}"}))